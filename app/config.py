@@ -1,34 +1,73 @@
+import functools
 import os
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
-HOST = os.getenv("ANKICONNECT_HOST", "127.0.0.1")
-PORT = int(os.getenv("ANKICONNECT_PORT", "8765"))
-API_KEY = os.getenv("ANKICONNECT_API_KEY")
-CORS_ORIGINS = os.getenv("ANKICONNECT_CORS_ORIGINS", "http://localhost").split(",")
 
-SYNC_ENDPOINT = os.getenv("SYNC_ENDPOINT")
-SYNC_KEY = os.getenv("SYNC_KEY")
+def _parse_port(raw: str) -> int:
+    try:
+        return int(raw)
+    except ValueError:
+        raise ValueError(f"ANKICONNECT_PORT must be an integer, got {raw!r}") from None
 
-ANKI_BASE_DIR = os.getenv("ANKI_BASE_DIR")
 
-LOGLEVEL = os.getenv("LOGLEVEL", "INFO")
+def _parse_origins(raw: str) -> list[str]:
+    return [origin.strip() for origin in raw.split(",")]
+
+
+# Setting name -> reader; __getattr__ exposes each one as a module attribute
+_SETTINGS = {
+    "HOST": lambda: os.getenv("ANKICONNECT_HOST", "127.0.0.1"),
+    "PORT": lambda: _parse_port(os.getenv("ANKICONNECT_PORT", "8765")),
+    "API_KEY": lambda: os.getenv("ANKICONNECT_API_KEY"),
+    "CORS_ORIGINS": lambda: _parse_origins(
+        os.getenv("ANKICONNECT_CORS_ORIGINS", "http://localhost")
+    ),
+    "SYNC_ENDPOINT": lambda: os.getenv("SYNC_ENDPOINT"),
+    "SYNC_KEY": lambda: os.getenv("SYNC_KEY"),
+    "ANKI_BASE_DIR": lambda: os.getenv("ANKI_BASE_DIR"),
+    "LOGLEVEL": lambda: os.getenv("LOGLEVEL", "INFO"),
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _snapshot():
+    """Read configuration from the environment, once until reload()"""
+    return {name: read() for name, read in _SETTINGS.items()}
+
+
+def reload():
+    """Re-read configuration from the environment on next access"""
+    _snapshot.cache_clear()
+
+
+def __getattr__(name):
+    # Names outside _SETTINGS fail without reading the environment, so
+    # introspection works even with a bad config
+    if name not in _SETTINGS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return _snapshot()[name]
+
+
+def __dir__():
+    return sorted([*globals(), *_SETTINGS])
 
 
 def get_ankiconnect_config():
     """Get configuration in AnkiConnect plugin format"""
+    config = _snapshot()
     return {
-        "apiKey": API_KEY,
+        "apiKey": config["API_KEY"],
         "apiLogPath": None,
         "apiPollInterval": 25,
         "apiVersion": 6,
         "webBacklog": 5,
-        "webBindAddress": HOST,
-        "webBindPort": PORT,
+        "webBindAddress": config["HOST"],
+        "webBindPort": config["PORT"],
         "webCorsOrigin": None,
-        "webCorsOriginList": CORS_ORIGINS,
+        "webCorsOriginList": config["CORS_ORIGINS"],
         "ignoreOriginList": [],
         "webTimeout": 10000,
     }
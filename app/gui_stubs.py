@@ -19,8 +19,10 @@ class MinimalMock:
         pass
 
     def __getattr__(self, name: str) -> "MinimalMock":
-        """Return another MinimalMock for any attribute access"""
-        return MinimalMock()
+        """Return another MinimalMock for any attribute access, the same one per name"""
+        # Only called for missing attributes; once stored, later lookups skip this
+        child = self.__dict__[name] = MinimalMock()
+        return child
 
     def __call__(self, *args: Any, **kwargs: Any) -> "MinimalMock":
         """Allow the mock to be called - just return self for chaining"""
@@ -151,6 +153,22 @@ class MockAqt:
         )
 
 
+# Built once; installing is then just a sys.modules update
+_mock_aqt = MockAqt()
+_STUB_TABLE: dict[str, Any] = {
+    "aqt": _mock_aqt,
+    "aqt.qt": _mock_aqt.qt,
+    "aqt.editor": _mock_aqt.editor,
+    "aqt.editcurrent": _mock_aqt.editcurrent,
+    "aqt.forms": _mock_aqt.forms,
+    "aqt.browser": _mock_aqt.browser,
+    "aqt.browser.previewer": _mock_aqt._previewer_module,
+    "aqt.utils": _mock_aqt.utils,
+    "aqt.import_export": _mock_aqt.import_export,
+    "aqt.gui_hooks": _mock_aqt.gui_hooks,
+}
+
+
 def install_gui_stubs() -> MockAqt | ModuleType:
     """
     Install simplified GUI stubs by patching sys.modules.
@@ -162,24 +180,5 @@ def install_gui_stubs() -> MockAqt | ModuleType:
         logger.debug("aqt module already exists, returning existing instance")
         return sys.modules["aqt"]
 
-    # Create mock aqt module
-    mock_aqt = MockAqt()
-
-    # Install main modules
-    sys.modules["aqt"] = mock_aqt  # type: ignore
-    sys.modules["aqt.qt"] = mock_aqt.qt  # type: ignore
-    sys.modules["aqt.editor"] = mock_aqt.editor  # type: ignore
-    sys.modules["aqt.editcurrent"] = mock_aqt.editcurrent  # type: ignore
-    sys.modules["aqt.forms"] = mock_aqt.forms  # type: ignore
-    sys.modules["aqt.browser"] = mock_aqt.browser  # type: ignore
-    sys.modules["aqt.browser.previewer"] = mock_aqt._previewer_module  # type: ignore
-    sys.modules["aqt.utils"] = mock_aqt.utils  # type: ignore
-    sys.modules["aqt.import_export"] = mock_aqt.import_export  # type: ignore
-    sys.modules["aqt.gui_hooks"] = mock_aqt.gui_hooks  # type: ignore
-
-    return mock_aqt
-
-
-# Auto-install stubs when this module is imported
-if "aqt" not in sys.modules:
-    install_gui_stubs()
+    sys.modules.update(_STUB_TABLE)
+    return _mock_aqt
@@ -1,6 +1,7 @@
 import argparse
 import json
 import logging
+import time
 from pathlib import Path
 from threading import Lock, Timer
 
@@ -90,9 +91,16 @@ def handle_request():
 
     # Handle request through AnkiConnectBridge
     try:
+        queued_at = time.perf_counter()
         with collection_lock:
+            started_at = time.perf_counter()
             result = ankiconnect.handler(data)
             collection_changed = ankiconnect.check_and_update_modified()
+        finished_at = time.perf_counter()
+        logger.debug(
+            f"Handled {action} in {(finished_at - started_at) * 1000:.1f} ms "
+            f"(waited {(started_at - queued_at) * 1000:.1f} ms for collection lock)"
+        )
         logger.debug(f"Reply body: {result}")
         if action in ["sync", "fullSync"]:
             # disable/restart sync timers if we already synced
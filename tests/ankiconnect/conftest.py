@@ -2,10 +2,15 @@
 Adaptation of libs/ankiconnect/tests/conftest.py to run the same tests with our own AnkiConnectBridge
 """
 
+import copy
+import inspect
+import os
 import shutil
 import sys
 import tempfile
-import time
+import threading
+import warnings
+import weakref
 from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
@@ -14,41 +19,148 @@ import pytest
 
 from app.core import AnkiConnectBridge
 
-# Add path so test files (which are symlinked) can import this conftest.py
-sys.path.append("tests/ankiconnect")
-
-# Create global instances that AnkiConnect tests expect
-temp_dir = tempfile.mkdtemp()
-ac = AnkiConnectBridge(base_dir=Path(temp_dir))
-setattr(ac, "base", temp_dir)
-
-
-# wait for n seconds, while events are being processed
+# Test files (which are symlinked) do `from conftest import ...`; alias this module
+# so they share it instead of importing a second copy with its own bridge
+sys.modules.setdefault("conftest", sys.modules[__name__])
+
+SHM_DIR = "/dev/shm"
+
+
+class AnkiConnectWrapper:
+    """
+    Stand-in for the global AnkiConnectBridge the AnkiConnect tests import.
+
+    The bridge and its collection are only created on first use, so collecting
+    tests (or running ones that don't need it) doesn't open a collection.
+    """
+
+    def __init__(self):
+        self.bridge: AnkiConnectBridge | None = None
+        self.base: str | None = None
+        # Snapshot the collection file was last saved to or restored from, and the
+        # write count at that point; snapshot files are removed along with base
+        self._matched: tuple[Path, int] | None = None
+        self._snapshot_count = 0
+        # Names of bridge methods cached in the instance dict by __getattr__
+        self._cached: set[str] = set()
+
+    def open(self) -> AnkiConnectBridge:
+        if self.bridge is None:
+            # Keep the collection on tmpfs where available
+            self.base = tempfile.mkdtemp(
+                dir=SHM_DIR if os.access(SHM_DIR, os.W_OK) else None
+            )
+            self.bridge = AnkiConnectBridge(base_dir=Path(self.base))
+            # Fixture teardown closes the bridge; this only catches ones left open
+            self._finalizer = weakref.finalize(
+                self, close_leaked_bridge, self.bridge, self.base
+            )
+            relax_durability()
+        return self.bridge
+
+    def close(self):
+        if self.bridge is None:
+            return
+        self._finalizer.detach()
+        self.bridge.close()
+        self.bridge = None
+        self._matched = None
+        for name in self._cached:
+            del self.__dict__[name]
+        self._cached.clear()
+        # Remove the collection while pytest reports; non-daemon, so it finishes before exit
+        threading.Thread(
+            target=shutil.rmtree, args=(self.base,), kwargs={"ignore_errors": True}
+        ).start()
+
+    def snapshot(self) -> Path:
+        """Save the collection file, reusing the last snapshot if nothing was written"""
+        self.open()
+        if self._matched is not None and self.matches_snapshot(self._matched[0]):
+            return self._matched[0]
+        self._snapshot_count += 1
+        path = Path(self.base) / f"snapshot-{self._snapshot_count}.anki2"
+        self.save_snapshot(path)
+        return path
+
+    def matches_snapshot(self, path: Path) -> bool:
+        """Whether the collection is unchanged since it was saved to/restored from path"""
+        return self._matched == (path, self._write_count())
+
+    def save_snapshot(self, path: Path):
+        """Copy the collection file to path"""
+        self._copy_while_closed(self.open().collection_path, path)
+        self._matched = (path, self._write_count())
+
+    def restore_snapshot(self, path: Path):
+        """Replace the collection file with one saved by save_snapshot()"""
+        self._copy_while_closed(path, self.open().collection_path)
+        self._matched = (path, self._write_count())
+
+    def _write_count(self) -> int:
+        # Rows written since the collection was (re)opened; unlike col.mod, this
+        # also moves for raw SQL writes (e.g. relearnCards)
+        return self.collection().db.scalar("select total_changes()")
+
+    def _copy_while_closed(self, src, dst):
+        # Closing checkpoints the WAL, so the .anki2 file alone is complete
+        self._matched = None
+        col = self.collection()
+        col.close()
+        try:
+            shutil.copyfile(src, dst)
+        finally:
+            col.reopen()
+            relax_durability()
+
+    def __getattr__(self, name):
+        # Don't open the bridge for private/dunder probes (e.g. by pytest collection)
+        if name.startswith("_"):
+            raise AttributeError(name)
+        attr = getattr(self.open(), name)
+        # Bound methods don't change while the bridge is open, so later lookups can
+        # skip __getattr__; plain attributes may change and are always forwarded
+        if inspect.ismethod(attr):
+            self.__dict__[name] = attr
+            self._cached.add(name)
+        return attr
+
+
+def close_leaked_bridge(bridge: AnkiConnectBridge, base: str):
+    warnings.warn(f"AnkiConnect test bridge for {base} was never closed", stacklevel=2)
+    bridge.close()
+    shutil.rmtree(base, ignore_errors=True)
+
+
+ac = AnkiConnectWrapper()
+
+
+def relax_durability():
+    """Trade durability for speed on the throwaway test collection"""
+    # Anki already opens collections in WAL mode
+    db = ac.collection().db
+    db.execute("pragma synchronous = off")
+    db.execute("pragma temp_store = memory")
+    db.execute("pragma mmap_size = 268435456")
+
+
+# upstream waits for Qt events to be processed; without a GUI there are none
 def wait(seconds):
-    time.sleep(seconds)
-
-
-def delete_model(model_name):
-    model = ac.collection().models.by_name(model_name)
-    ac.collection().models.remove(model["id"])
+    pass
 
 
 @contextmanager
 def current_decks_and_models_etc_preserved():
-    """Preserve deck and model state during tests"""
-    deck_names_before = set(ac.deckNames())
-    model_names_before = set(ac.modelNames())
+    """Preserve collection state during tests by restoring a snapshot of its file"""
+    # Usually the state the previous test restored, so entering is free
+    snapshot = ac.snapshot()
 
     try:
         yield
     finally:
-        deck_names_after = set(ac.deckNames())
-        model_names_after = set(ac.modelNames())
-
-        # Clean up new decks and models
-        ac.deleteDecks(decks=deck_names_after - deck_names_before, cardsToo=True)
-        for model_name in model_names_after - model_names_before:
-            delete_model(model_name)
+        # Nothing to restore if nothing was written
+        if not ac.matches_snapshot(snapshot):
+            ac.restore_snapshot(snapshot)
 
 
 @dataclass
@@ -95,9 +207,11 @@ def set_up_test_deck_and_test_model_and_two_notes():
         )
     )
 
-    note1_card_ids = ac.findCards(query=f"nid:{note1_id}")
-    note2_card_ids = ac.findCards(query=f"nid:{note2_id}")
+    # The deck holds exactly these two notes, so one search covers all three lists
     card_ids = ac.findCards(query="deck:test_deck")
+    nid_by_card = {c: ac.collection().get_card(c).nid for c in card_ids}
+    note1_card_ids = [c for c in card_ids if nid_by_card[c] == note1_id]
+    note2_card_ids = [c for c in card_ids if nid_by_card[c] == note2_id]
 
     return Setup(
         deck_id=deck_id,
@@ -118,7 +232,9 @@ def anki_connect_config_loaded(session, web_bind_port):
 # Pytest fixtures matching original conftest.py interface
 @pytest.fixture(scope="session")
 def session_scope_empty_session():
+    ac.open()
     yield ac
+    ac.close()
 
 
 @pytest.fixture(scope="session")
@@ -132,12 +248,19 @@ def session_with_profile_loaded(session_scope_empty_session):
         yield session_scope_empty_session
 
 
-@pytest.fixture
-def setup(session_with_profile_loaded):
-    yield set_up_test_deck_and_test_model_and_two_notes()
+@pytest.fixture(scope="session")
+def golden_setup(session_scope_empty_session):
+    """Build the setup data once and save the resulting collection as a template"""
+    path = Path(ac.base) / "golden.anki2"
+    with current_decks_and_models_etc_preserved():
+        setup = set_up_test_deck_and_test_model_and_two_notes()
+        ac.save_snapshot(path)
+    yield path, setup
 
 
-# Pytest configuration hooks
-def pytest_sessionfinish(session, exitstatus):
-    ac.close()
-    shutil.rmtree(temp_dir)
+@pytest.fixture
+def setup(session_with_profile_loaded, golden_setup):
+    path, setup = golden_setup
+    ac.restore_snapshot(path)
+    # Plugin methods may mutate the id lists they are given (e.g. suspend)
+    yield copy.deepcopy(setup)
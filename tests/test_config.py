@@ -0,0 +1,62 @@
+import pytest
+
+import app.config
+
+
+@pytest.fixture
+def env(monkeypatch):
+    """Environment for app.config; the snapshot is re-read afterwards"""
+    yield monkeypatch
+    monkeypatch.undo()
+    app.config.reload()
+
+
+def test_reload_rereads_environment(env):
+    env.setenv("ANKICONNECT_PORT", "8765")
+    app.config.reload()
+    assert app.config.PORT == 8765
+
+    env.setenv("ANKICONNECT_PORT", "9999")
+    assert app.config.PORT == 8765
+    app.config.reload()
+    assert app.config.PORT == 9999
+    assert app.config.get_ankiconnect_config()["webBindPort"] == 9999
+
+
+def test_from_import(env):
+    env.setenv("ANKICONNECT_PORT", "9999")
+    app.config.reload()
+    from app.config import PORT
+
+    assert PORT == 9999
+
+
+def test_unknown_attribute_skips_environment(env):
+    env.setenv("ANKICONNECT_PORT", "invalid")
+    app.config.reload()
+    assert not hasattr(app.config, "__path__")
+    with pytest.raises(AttributeError):
+        app.config.NOT_A_SETTING  # noqa: B018
+    with pytest.raises(ValueError):
+        app.config.PORT  # noqa: B018
+
+
+def test_cors_origins_are_stripped(env):
+    env.setenv("ANKICONNECT_CORS_ORIGINS", "http://a, http://b")
+    app.config.reload()
+    assert app.config.CORS_ORIGINS == ["http://a", "http://b"]
+
+
+def test_parse_port():
+    assert app.config._parse_port("9999") == 9999
+
+
+def test_parse_port_invalid():
+    with pytest.raises(
+        ValueError, match="ANKICONNECT_PORT must be an integer, got 'invalid'"
+    ):
+        app.config._parse_port("invalid")
+
+
+def test_dir_lists_settings():
+    assert {"HOST", "PORT", "CORS_ORIGINS", "reload"} <= set(dir(app.config))
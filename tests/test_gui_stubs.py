@@ -0,0 +1,36 @@
+from unittest import mock
+
+from app.gui_stubs import MinimalMock
+
+
+def test_attribute_assignment():
+    stub = MinimalMock()
+    stub.x = 1
+    assert stub.x == 1
+
+
+def test_none_assignment():
+    stub = MinimalMock()
+    stub.x = None
+    assert stub.x is None
+
+
+def test_attribute_deletion():
+    stub = MinimalMock()
+    stub.x = 1
+    del stub.x
+    assert isinstance(stub.x, MinimalMock)
+
+
+def test_patch_object():
+    stub = MinimalMock()
+    original = stub.showInfo
+    with mock.patch.object(stub, "showInfo", return_value="patched"):
+        assert stub.showInfo() == "patched"
+    assert stub.showInfo is original
+
+
+def test_attribute_access_is_cached():
+    stub = MinimalMock()
+    assert stub.x is stub.x
+    assert stub.x.y is stub.x.y